@@ -1,2 +1,3 @@
 # -*- coding: utf-8 -*-
 from . import test_exception
+from . import test_tiktok
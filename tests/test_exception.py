@@ -1,13 +1,24 @@
+import inspect
+import logging
+import pickle
 import unittest
-from x2t.exception import ErrorHandler
+from collections import deque
+from unittest import mock
+from x2t import exception
+from x2t.exception import ErrorHandler, handler
+
+
+@handler(log=False)
+def divide(a, b=1):
+    """Divides a by b."""
+    return a / b
 
 
 class TestError(unittest.TestCase):
 
     def test_error_exception(self):
-        with self.assertRaises(ZeroDivisionError):
-            self.raise_exception_division()
-            self.raise_exception_combine_types()
+        self.assertEqual(self.raise_exception_division()["status"], "failed")
+        self.assertEqual(self.raise_exception_combine_types()["status"], "failed")
 
     @ErrorHandler.exception(log=False)
     def raise_exception_division(self):
@@ -18,5 +29,167 @@ class TestError(unittest.TestCase):
         return "a" + True
 
 
+class TestWrapperArguments(unittest.TestCase):
+
+    def test_private_keyword_arguments_pass_through(self):
+        for options in ({}, {"log": False}, {"timing": True}, {"log": False, "timing": True}):
+            @handler(**options)
+            def echo(x, _name=None, _func=None):
+                return x, _name, _func
+
+            self.assertEqual(echo(1, _name="mine", _func="f"), (1, "mine", "f"))
+
+
+class TestWrapperMetadata(unittest.TestCase):
+
+    def test_wrapper_metadata(self):
+        self.assertEqual(divide.__name__, "divide")
+        self.assertEqual(divide.__module__, __name__)
+        self.assertEqual(divide.__doc__, "Divides a by b.")
+        self.assertEqual(str(inspect.signature(divide)), "(a, b=1)")
+
+    def test_wrapper_keeps_function_attributes(self):
+        def compute(x):
+            return x
+
+        compute._depends = ("x",)
+        self.assertEqual(handler()(compute)._depends, ("x",))
+
+    def test_wrapper_pickles(self):
+        self.assertIs(pickle.loads(pickle.dumps(divide)), divide)
+
+
+class TestErrorResult(unittest.TestCase):
+
+    def test_error_result(self):
+        result = self.raise_exception_division()
+        self.assertEqual(result["status"], "failed")
+        self.assertEqual(result["error"], "division by zero")
+        with self.assertRaises(KeyError):
+            result["missing"]
+
+    def test_error_result_mapping(self):
+        result = self.raise_exception_division()
+        expected = {"error": "division by zero", "status": "failed"}
+        self.assertIn("error", result)
+        self.assertNotIn("missing", result)
+        self.assertEqual(result.get("status"), "failed")
+        self.assertIsNone(result.get("missing"))
+        self.assertEqual(list(result.keys()), ["error", "status"])
+        self.assertEqual(list(result), ["error", "status"])
+        self.assertEqual(result, expected)
+        self.assertEqual(dict(result), expected)
+        self.assertEqual(repr(result), repr(expected))
+
+    def test_error_is_formatted_lazily(self):
+        calls = []
+
+        class LazyError(Exception):
+            def __str__(self):
+                calls.append(1)
+                return "lazy"
+
+        error = LazyError()
+
+        @handler(log=False)
+        def fail():
+            raise error
+
+        result = fail()
+        self.assertEqual(result["status"], "failed")
+        self.assertEqual(calls, [])
+        self.assertIsNotNone(error.__traceback__)
+        self.assertEqual(result["error"], "lazy")
+        self.assertEqual(result["error"], "lazy")
+        self.assertEqual(calls, [1])
+
+    @handler(log=False)
+    def raise_exception_division(self):
+        return 1 / 0
+
+
+class TestAggregate(unittest.TestCase):
+
+    def test_aggregate_errors(self):
+        for _ in range(3):
+            self.assertEqual(self.raise_exception_aggregate()["status"], "failed")
+        with self.assertLogs(exception.logger, level="ERROR") as logs:
+            exception._flush_errors()
+        self.assertEqual(len(logs.records), 1)
+        self.assertIn("3 occurrences of ZeroDivisionError", logs.output[0])
+
+    def test_aggregate_restarts_after_fork(self):
+        self.raise_exception_aggregate()
+        self.assertIsNotNone(exception._flush_timer)
+        exception._reset_errors_after_fork()
+        self.assertIsNone(exception._flush_timer)
+        self.assertEqual(exception._counter, {})
+        self.raise_exception_aggregate()
+        self.assertTrue(exception._flush_timer.is_alive())
+        with self.assertLogs(exception.logger, level="ERROR") as logs:
+            exception._flush_errors()
+        self.assertIn("1 occurrences of ZeroDivisionError", logs.output[0])
+
+    @handler(aggregate=True)
+    def raise_exception_aggregate(self):
+        return 1 / 0
+
+
+class TestTiming(unittest.TestCase):
+
+    def setUp(self):
+        exception._flush_timings()
+        exception.logger.setLevel(logging.INFO)
+        self.addCleanup(exception.logger.setLevel, logging.NOTSET)
+
+    def test_timing_summary(self):
+        with mock.patch.object(exception, "_start_timing_flusher"):
+            self.timed(1)
+            self.timed(0)
+        with self.assertLogs(exception.logger, level="INFO") as logs:
+            exception._flush_timings()
+        summaries = [r.getMessage() for r in logs.records if r.levelno == logging.INFO]
+        self.assertEqual(len(summaries), 1)
+        self.assertTrue(summaries[0].startswith("timed executed 2 times in "))
+
+    def test_timing_skipped_when_info_disabled(self):
+        exception.logger.setLevel(logging.WARNING)
+        with mock.patch.object(exception, "_start_timing_flusher") as start:
+            self.timed(1)
+        self.assertEqual(len(exception._timings), 0)
+        start.assert_not_called()
+
+    def test_flusher_starts_lazily_and_exits_when_idle(self):
+        with self.assertLogs(exception.logger, level="INFO") as logs:
+            self.timed(1)
+            thread = exception._timing_thread
+            self.assertTrue(thread.is_alive())
+            thread.join(timeout=5)
+        self.assertFalse(thread.is_alive())
+        self.assertIsNone(exception._timing_thread)
+        self.assertIn("timed executed 1 times", logs.output[0])
+
+    def test_overflow_is_reported(self):
+        with mock.patch.object(exception, "_timings", deque(maxlen=2)), \
+                mock.patch.object(exception, "_start_timing_flusher"):
+            for _ in range(3):
+                self.timed(1)
+            with self.assertLogs(exception.logger, level="INFO") as logs:
+                exception._flush_timings()
+        self.assertIn("lower bounds", logs.output[0])
+        self.assertIn("timed executed 2 times", logs.output[1])
+
+    def test_reset_after_fork(self):
+        with mock.patch.object(exception, "_start_timing_flusher"):
+            self.timed(1)
+        exception._reset_timings_after_fork()
+        self.assertEqual(len(exception._timings), 0)
+        self.assertIsNone(exception._timing_thread)
+
+    @handler(log=False, timing=True)
+    def timed(self, x):
+        return 1 / x
+
+
 if __name__ == '__main__':
     unittest.main()
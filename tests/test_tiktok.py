@@ -0,0 +1,145 @@
+import hashlib
+import hmac
+import json
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from unittest import mock
+
+import requests
+from requests import get, post
+from x2t import tiktok
+from x2t.tiktok import dump_body, request_common, sign
+
+
+def baseline_sign(endpoint, params, app_secret, body=None):
+    keys = sorted(key for key in params if key not in ["sign", "access_token"])
+    input_data = "".join(key + str(params[key]) for key in keys)
+    if isinstance(body, dict):
+        input_data += json.dumps(body, separators=(',', ':'))
+    input_data = app_secret + endpoint + input_data + app_secret
+    return hmac.new(app_secret.encode(), input_data.encode(), hashlib.sha256).hexdigest()
+
+
+class CookieHandler(BaseHTTPRequestHandler):
+    cookies = []
+
+    def do_GET(self):
+        self.cookies.append(self.headers.get("Cookie"))
+        self.send_response(200)
+        self.send_header("Set-Cookie", "sid=tenant-a; Path=/")
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+class TestSign(unittest.TestCase):
+
+    def test_golden_signature(self):
+        params = {"app_key": "k1", "timestamp": "1700000000", "page_size": "20"}
+        self.assertEqual(
+            sign("/api/orders/search", params, "secret", {"status": "PAID"}),
+            "cf625acd35648e6e112aa94f0fa74d93bd05cb5f08afd45c5cd531419bdb6b54")
+
+    def test_matches_baseline(self):
+        cases = [
+            ("/api/products", {"app_key": "k", "timestamp": "1"}, "s", None),
+            ("/api/products", {"b": "2", "a": "1"}, "s", {"ids": [1, 2], "name": "x"}),
+            ("/api/orders", {"app_key": "k"}, "s", {}),
+        ]
+        for case in cases:
+            self.assertEqual(sign(*case), baseline_sign(*case))
+
+    def test_excluded_keys(self):
+        params = {"app_key": "k", "timestamp": "1"}
+        self.assertEqual(
+            sign("/api", {**params, "sign": "old", "access_token": "token"}, "s"),
+            sign("/api", params, "s"))
+
+    def test_non_str_values(self):
+        params = {"page_size": 20, "timestamp": 1700000000, "flag": True}
+        self.assertEqual(sign("/api", params, "s"), baseline_sign("/api", params, "s"))
+
+    def test_body_rejects_nan(self):
+        with self.assertRaises(ValueError):
+            dump_body({"a": float("nan")})
+        with self.assertRaises(ValueError):
+            sign("/ep", {}, "s", {"a": float("inf")})
+
+    def test_cache_distinguishes_equal_values(self):
+        for value in (1, True, 1.0, "1"):
+            self.assertEqual(sign("/ep", {"a": value}, "s"), baseline_sign("/ep", {"a": value}, "s"))
+
+
+class TestRequestCommon(unittest.TestCase):
+
+    def test_method_names(self):
+        with mock.patch("requests.sessions.Session.request") as request:
+            for method in (requests.post, "post", "POST", "Post"):
+                request_common("https://host", "/api", method, {"timestamp": "1"})
+                self.assertEqual(request.call_args.args[0], "POST")
+
+    def test_url_and_timestamp(self):
+        params = {"app_key": "k"}
+        with mock.patch("requests.sessions.Session.request") as request, \
+                mock.patch.object(tiktok, "_time", return_value=1700000000.5):
+            request_common("https://host/", "/api/orders", get, params, {"h": "v"})
+        self.assertEqual(request.call_args.args,
+                         ("GET", "https://host/api/orders?app_key=k&timestamp=1700000000"))
+        self.assertEqual(request.call_args.kwargs["headers"], {"h": "v"})
+        self.assertEqual(params, {"app_key": "k"})
+
+    def test_keeps_given_timestamp(self):
+        with mock.patch("requests.sessions.Session.request") as request:
+            request_common("https://host", "api", "delete", {"timestamp": "42"})
+        self.assertEqual(request.call_args.args, ("DELETE", "https://host/api?timestamp=42"))
+
+    def test_signed_body_is_sent_body(self):
+        params = {"app_key": "k", "timestamp": "1"}
+        for body in ({"name": "Áo thun", "ids": [1, 2]}, [1, "x"], {}):
+            body_bytes = dump_body(body)
+            signature = sign("/api", params, "s", body_bytes)
+            self.assertEqual(signature, sign("/api", params, "s", body))
+            for sent_body in (body, body_bytes):
+                with mock.patch("requests.sessions.Session.request") as request:
+                    request_common("https://host", "/api", "post", params, None, sent_body)
+                sent = request.call_args.kwargs["data"]
+                self.assertEqual(sent, body_bytes)
+                self.assertEqual(request.call_args.kwargs["headers"], {"Content-Type": "application/json"})
+            expected = hmac.new(b"s", b"s/apiapp_keyktimestamp1" + sent + b"s", hashlib.sha256).hexdigest()
+            self.assertEqual(signature, expected)
+
+    def test_invalid_method(self):
+        with self.assertRaises(ValueError):
+            request_common("https://host", "/api", print)
+        with self.assertRaises(ValueError):
+            request_common("https://host", "/api", "head")
+        with self.assertRaises(ValueError):
+            request_common("https://host", "/api", ["get"])
+
+    def test_session_keeps_no_cookies(self):
+        server = HTTPServer(("127.0.0.1", 0), CookieHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        url = f"http://127.0.0.1:{server.server_port}"
+        request_common(url, "/", "get")
+        request_common(url, "/", "get")
+        self.assertEqual(CookieHandler.cookies, [None, None])
+        self.assertEqual(len(tiktok._SESSION.cookies), 0)
+
+    def test_reset_session_after_fork(self):
+        session = tiktok._SESSION
+        self.addCleanup(setattr, tiktok, "_SESSION_METHODS", tiktok._SESSION_METHODS)
+        self.addCleanup(setattr, tiktok, "_SESSION", session)
+        tiktok._reset_session_after_fork()
+        self.assertIsNot(tiktok._SESSION, session)
+        self.assertEqual(tiktok._SESSION_METHODS["get"], tiktok._SESSION.get)
+        self.assertIs(tiktok._SESSION_METHODS[post].__self__, tiktok._SESSION)
+        self.assertEqual(tiktok._SESSION.cookies.get_policy().allowed_domains(), ())
+
+
+if __name__ == '__main__':
+    unittest.main()
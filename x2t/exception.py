@@ -1,20 +1,215 @@
+import atexit
 import logging
+import os
+import threading
+import time
 
-from functools import wraps
+from collections import deque
+from collections.abc import Mapping
+from functools import partial, update_wrapper
+from logging import ERROR, INFO
+from typing import Dict, Tuple
 
 
 logger = logging.getLogger(__name__)
 
+_AGGREGATE_INTERVAL = 1.0
 
-def handler(log: bool = True):
+_counter: Dict[Tuple[str, str, str], int] = {}
+_counter_lock = threading.Lock()
+_flush_timer = None
+
+
+def _flush_errors():
+    global _counter, _flush_timer
+    with _counter_lock:
+        counter, _counter = _counter, {}
+        _flush_timer = None
+    for (name, exc_type, message), count in counter.items():
+        logger.error("%s: %d occurrences of %s: %s", name, count, exc_type, message)
+
+
+def _record_error(name, e):
+    global _flush_timer
+    key = (name, type(e).__name__, str(e))
+    with _counter_lock:
+        _counter[key] = _counter.get(key, 0) + 1
+        if _flush_timer is None:
+            _flush_timer = threading.Timer(_AGGREGATE_INTERVAL, _flush_errors)
+            _flush_timer.daemon = True
+            _flush_timer.start()
+
+
+def _reset_errors_after_fork():
+    # The parent still owns (and will flush) the counts taken before the fork;
+    # its pending timer thread does not exist in the child.
+    global _counter, _counter_lock, _flush_timer
+    _counter = {}
+    _counter_lock = threading.Lock()
+    _flush_timer = None
+
+
+atexit.register(_flush_errors)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_errors_after_fork)
+
+_TIMING_INTERVAL = 0.1
+
+_timings: deque = deque(maxlen=8192)
+_timing_lock = threading.Lock()
+_timing_thread = None
+
+
+def _flush_timings():
+    if len(_timings) == _timings.maxlen:
+        logger.warning("Timing buffer overflowed; counts below are lower bounds")
+    stats: Dict[str, list] = {}
+    popleft = _timings.popleft
+    while True:
+        try:
+            name, elapsed_ns = popleft()
+        except IndexError:
+            break
+        entry = stats.get(name)
+        if entry is None:
+            stats[name] = [1, elapsed_ns, elapsed_ns]
+        else:
+            entry[0] += 1
+            entry[1] += elapsed_ns
+            if elapsed_ns > entry[2]:
+                entry[2] = elapsed_ns
+    for name, (count, total_ns, max_ns) in stats.items():
+        logger.info("%s executed %d times in %d ns (avg %d ns, max %d ns)",
+                    name, count, total_ns, total_ns // count, max_ns)
+
+
+def _run_timing_flusher():
+    global _timing_thread
+    while True:
+        time.sleep(_TIMING_INTERVAL)
+        _flush_timings()
+        # Exit once idle. _timing_thread is cleared before the emptiness check,
+        # so a sample appended after the check always sees None and restarts us.
+        with _timing_lock:
+            _timing_thread = None
+            if not _timings:
+                return
+            _timing_thread = threading.current_thread()
+
+
+def _start_timing_flusher():
+    global _timing_thread
+    with _timing_lock:
+        if _timing_thread is None:
+            _timing_thread = threading.Thread(
+                target=_run_timing_flusher, name="x2t-timings", daemon=True)
+            _timing_thread.start()
+
+
+def _record_timing(sample):
+    _timings.append(sample)
+    if _timing_thread is None:
+        _start_timing_flusher()
+
+
+def _reset_timings_after_fork():
+    # The flusher thread does not survive fork(); the parent reports its own samples.
+    global _timing_lock, _timing_thread
+    _timings.clear()
+    _timing_lock = threading.Lock()
+    _timing_thread = None
+
+
+atexit.register(_flush_timings)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_timings_after_fork)
+
+
+class ErrorResult(Mapping):
+    __slots__ = ("_exc", "_error", "status")
+
+    _keys = ("error", "status")
+
+    def __init__(self, exc):
+        self._exc = exc
+        self._error = None
+        self.status = "failed"
+
+    @property
+    def error(self):
+        if self._error is None:
+            self._error = str(self._exc)
+        return self._error
+
+    def __getitem__(self, key):
+        if key not in self._keys:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self):
+        return iter(self._keys)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __repr__(self):
+        return repr(dict(self))
+
+
+def handler(log: bool = True, timing: bool = False, aggregate: bool = False):
     def decorator(func):
-        @wraps(func)
-        def wrapper(*args, **kwargs):
+        name = func.__name__
+        report = _record_error if aggregate else partial(logger.error, "An error occurred in %s: %s")
+        enabled = logger.isEnabledFor
+        record = _record_timing
+        pc = time.perf_counter_ns
+
+        if log and timing:
+            def _wrap_log_time(*args, **kwargs):
+                start_ns = pc()
+                try:
+                    return func(*args, **kwargs)
+                except Exception as e:
+                    if enabled(ERROR):
+                        report(name, e)
+                    return ErrorResult(e)
+                finally:
+                    elapsed_ns = pc() - start_ns
+                    if enabled(INFO):
+                        record((name, elapsed_ns))
+            return update_wrapper(_wrap_log_time, func)
+
+        if log:
+            def _wrap_log(*args, **kwargs):
+                try:
+                    return func(*args, **kwargs)
+                except Exception as e:
+                    if enabled(ERROR):
+                        report(name, e)
+                    return ErrorResult(e)
+            return update_wrapper(_wrap_log, func)
+
+        if timing:
+            def _wrap_time(*args, **kwargs):
+                start_ns = pc()
+                try:
+                    return func(*args, **kwargs)
+                except Exception as e:
+                    return ErrorResult(e)
+                finally:
+                    elapsed_ns = pc() - start_ns
+                    if enabled(INFO):
+                        record((name, elapsed_ns))
+            return update_wrapper(_wrap_time, func)
+
+        def _wrap_plain(*args, **kwargs):
             try:
                 return func(*args, **kwargs)
             except Exception as e:
-                if log:
-                    logger.error(f"An error occurred in {func.__name__}")
-                return {"error": str(e), "status": "failed"}
-        return wrapper
+                return ErrorResult(e)
+        return update_wrapper(_wrap_plain, func)
     return decorator
+
+
+class ErrorHandler:
+    exception = staticmethod(handler)
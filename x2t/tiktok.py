@@ -1,46 +1,132 @@
-import hashlib
 import hmac
 import json
-from requests import post, put, patch, delete, get, Response
-from typing import Callable, Dict
-from datetime import datetime
+import os
+import time
+from functools import lru_cache
+from http.cookiejar import DefaultCookiePolicy
+from requests import post, put, patch, delete, get, Response, Session
+from requests.adapters import HTTPAdapter
+from typing import Callable, Dict, Union
 from urllib.parse import urlencode
 
+# Passed by name so hmac.digest dispatches to OpenSSL's one-shot HMAC, which
+# uses the CPU's SHA extensions where available.
+_SIGN_DIGEST = "sha256"
+
+_time = time.time
+
+_ALLOWED = frozenset((get, post, put, patch, delete))
+
+
+def _new_session() -> tuple[Session, Dict]:
+    session = Session()
+    session.mount("https://", HTTPAdapter(pool_connections=10, pool_maxsize=50))
+    # The session is shared by every shop and access token in the process, so it
+    # must never carry cookies from one request to the next.
+    session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+    # Reroute the module-level requests helpers to the pooled session so repeated
+    # calls to the same host reuse keep-alive connections. Methods may also be
+    # given by name, e.g. "post".
+    methods = {m: getattr(session, m.__name__) for m in _ALLOWED}
+    methods.update({m.__name__: getattr(session, m.__name__) for m in _ALLOWED})
+    return session, methods
+
+
+def _reset_session_after_fork():
+    # Pooled keep-alive sockets are inherited across fork(); a child must open
+    # its own connections rather than share them with the parent.
+    global _SESSION, _SESSION_METHODS
+    _SESSION, _SESSION_METHODS = _new_session()
+
+
+_SESSION, _SESSION_METHODS = _new_session()
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_session_after_fork)
+
+
+def dump_body(body: Union[Dict, list]) -> bytes:
+    """Serializes a request body exactly as it is signed and sent."""
+    return json.dumps(body, separators=(',', ':'), ensure_ascii=False, allow_nan=False).encode('utf-8')
+
+
+@lru_cache(maxsize=256)
+def _join_url(base_url: str, endpoint: str) -> str:
+    return f"{base_url.rstrip('/')}/{endpoint.lstrip('/')}"
+
 
 def request_common(
     base_url: str,
     endpoint: str,
-    method: Callable,
+    method: Union[Callable, str],
     params: Dict[str, str] = None,
     headers: Dict[str, str] = None,
-    body: Dict = None,
+    body: Union[Dict, list, bytes] = None,
 ) -> Response:
-    if method not in {get, post, put, patch, delete}:
+    if isinstance(method, str):
+        method = method.lower()
+    try:
+        session_method = _SESSION_METHODS.get(method)
+    except TypeError:
+        session_method = None
+    if session_method is None:
         raise ValueError(
-            "Invalid method. Method must be one of: post, put, patch, delete.")
-    params = params or {}
-    if "timestamp" not in params:
-        params["timestamp"] = str(int(datetime.timestamp(datetime.now())))
-    query_string = urlencode(params)
-    url = f"{base_url.rstrip('/')}/{endpoint.lstrip('/')}?{query_string}"
-    return method(url=url, headers=headers, json=body)
+            "Invalid method. Method must be one of: get, post, put, patch, delete.")
+    ts = params.get("timestamp") if params else None
+    merged = {**(params or {}), "timestamp": ts or str(int(_time()))}
+    url = f"{_join_url(base_url, endpoint)}?{urlencode(merged)}"
+    if body is not None:
+        headers = {"Content-Type": "application/json", **(headers or {})}
+        if not isinstance(body, (bytes, bytearray)):
+            body = dump_body(body)
+    return session_method(url=url, headers=headers, data=body)
+
+
+@lru_cache(maxsize=256)
+def _sign_frame(app_secret: str, endpoint: str) -> tuple[bytes, bytes, bytes]:
+    """Returns the HMAC key and the bytes wrapped around the signed payload."""
+    secret_bytes = app_secret.encode()
+    return secret_bytes, (app_secret + endpoint).encode(), secret_bytes
+
+
+# Params normally carry a per-second timestamp, so this cache only pays off for
+# retries of the same request within that second. Keep it small: each entry
+# holds a full request body.
+@lru_cache(maxsize=32)
+def _sign_cached(endpoint: str, items: tuple, app_secret: str, body_bytes: bytes) -> str:
+    secret_bytes, prefix_bytes, suffix_bytes = _sign_frame(app_secret, endpoint)
+    buf = bytearray(prefix_bytes)
+    for k, v in items:
+        buf += k.encode()
+        buf += v.encode()
+    buf += body_bytes
+    buf += suffix_bytes
+    return hmac.digest(secret_bytes, buf, _SIGN_DIGEST).hex()
 
 
 def sign(endpoint: str, params: dict, app_secret: str, body=None) -> str:
-    """Generates a signature for TikTok Open API requests."""
-    keys = sorted(key for key in params if key not in ["sign", "access_token"])
-    input_data = "".join(key + params[key] for key in keys)
-    if isinstance(body, dict):
-        body_encoded = json.dumps(body, separators=(',', ':'))
-        input_data += body_encoded
+    """Generates a signature for TikTok Open API requests.
 
-    input_data = app_secret + endpoint + input_data + app_secret
-    return hmac.new(app_secret.encode(), input_data.encode(), hashlib.sha256).hexdigest()
+    ``body`` may be any JSON body ``request_common`` would send, or the bytes
+    from ``dump_body``; pass the same bytes to ``request_common`` to serialize
+    the body only once.
+    """
+    excluded = ("sign", "access_token")
+    # Key the cache on the strings that are actually signed: 1, 1.0 and True
+    # compare equal but sign differently.
+    items = tuple(sorted((k, v if type(v) is str else str(v))
+                         for k, v in params.items() if k not in excluded))
+    if body is None:
+        body_bytes = b""
+    elif isinstance(body, (bytes, bytearray)):
+        body_bytes = bytes(body)
+    else:
+        body_bytes = dump_body(body)
+    return _sign_cached(endpoint, items, app_secret, body_bytes)
 
 
 def get_common_parameters(object, content_type="application/json") -> tuple[Dict[str, str], Dict[str, str]]:
     """Generates common headers and query parameters."""
-    timestamp = str(int(datetime.timestamp(datetime.now())))
+    timestamp = str(int(_time()))
     headers = {
         "x-tts-access-token": object.access_token,
         "Content-Type": content_type